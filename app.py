@@ -1,13 +1,8 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import plotly.graph_objects as go
 from datetime import datetime
 
-# Import calculation modules from subdirectories
-from calculations import liquid_sizing, gas_sizing, noise_prediction, actuator_sizing
-from data import materials, valve_data
-from reporting import pdf_generator
+# Calculation modules are imported inside the step that uses them
+from data import valve_data
 from utils import helpers
 
 st.set_page_config(layout="wide", page_title="Control Valve Sizing & Selection")
@@ -25,6 +20,67 @@ def next_step():
 def prev_step():
     st.session_state.step -= 1
 
+# Selectbox options, with precomputed option -> index lookups for restoring saved choices
+_FLUID_TYPES = ("Liquid", "Gas/Vapor")
+_FLUID_NATURES = ("Clean", "Corrosive", "Abrasive", "Flashing/Cavitating")
+_VALVE_TYPES = ("Globe", "Ball (Segmented)", "Butterfly")
+_VALVE_CHARS = ("Equal Percentage", "Linear", "Quick Opening")
+_FAIL_POSITIONS = ("Fail Close (FC)", "Fail Open (FO)")
+# Nominal sizes offered in Step 2; rotary valves extend to larger bores
+_GLOBE_SIZES = (1, 2, 3, 4, 6, 8, 10, 12, 14, 16, 18, 20, 24)
+_LARGE_SIZES = _GLOBE_SIZES + (30, 36, 42, 48, 54, 60, 66, 72)
+
+_FLUID_TYPE_IDX = {v: i for i, v in enumerate(_FLUID_TYPES)}
+_FLUID_NATURE_IDX = {v: i for i, v in enumerate(_FLUID_NATURES)}
+_VALVE_TYPE_IDX = {v: i for i, v in enumerate(_VALVE_TYPES)}
+_GLOBE_SIZE_IDX = {v: i for i, v in enumerate(_GLOBE_SIZES)}
+_LARGE_SIZE_IDX = {v: i for i, v in enumerate(_LARGE_SIZES)}
+
+# Inputs that parameterize the characteristic curve, used as the PNG cache key
+_PLOT_KEYS = ('valve_char', 'rated_cv', 'inherent_rangeability')
+
+@st.cache_data(show_spinner=False, ttl=3600, max_entries=64)
+def _render_char_png(plot_inputs, cv):
+    # Kaleido export is the slowest part of Step 5; skip it when the curve is unchanged
+    fig = helpers.plot_valve_characteristic(dict(plot_inputs), cv)
+    return fig.to_image(format="png", width=800, height=400, scale=2)
+
+# Step 5 widgets only rerun this fragment; navigation stays outside as it changes the step.
+@st.fragment
+def _step5():
+    from calculations import actuator_sizing
+    from data import materials
+    with st.expander("Actuator Sizing", expanded=True):
+        fail_position = st.radio("Fail-Safe Position", _FAIL_POSITIONS, horizontal=True, help="The position the valve should move to on loss of power/air.")
+        st.session_state.input_data['fail_position'] = fail_position
+        actuator_results = actuator_sizing.size_actuator(st.session_state.input_data, st.session_state.results)
+        st.session_state.results.update(actuator_results)
+        if st.session_state.input_data['valve_type'] == 'Globe':
+            st.metric("Required Actuator Thrust", f"{actuator_results['required_force']:.2f} {units['force']}")
+        else:
+            st.metric("Required Actuator Torque", f"{actuator_results['required_torque']:.2f} {units['torque']}")
+        st.info(f"**Recommendation:** {actuator_results['actuator_recommendation']}")
+    with st.expander("Material Selection", expanded=True):
+        material_results = materials.select_materials(st.session_state.input_data)
+        st.session_state.results.update(material_results)
+        st.write("**Recommended Materials:**")
+        material_rows = "".join(f"| {component} | {material} |\n" for component, material in material_results['recommendations'].items())
+        st.markdown("| Component | Material |\n|---|---|\n" + material_rows)
+        st.success(f"**Compliance Check:** {material_results['compliance_check']}")
+    with st.expander("Valve Dynamic Characteristic Curve", expanded=True):
+        fig = helpers.plot_valve_characteristic(st.session_state.input_data, st.session_state.results['cv'])
+        st.plotly_chart(fig, use_container_width=True)
+        # Only re-export when the curve differs from the image already held for the report
+        plot_key = (helpers.freeze_inputs(st.session_state.input_data, _PLOT_KEYS), st.session_state.results['cv'])
+        if st.session_state.get('_plot_key') != plot_key:
+            try:
+                img_bytes = _render_char_png(*plot_key)
+                st.session_state.results['plot_image_bytes'] = img_bytes
+                st.session_state._plot_key = plot_key
+            except Exception as e:
+                st.warning(f"Could not generate plot image for report: {e}")
+                st.session_state.results['plot_image_bytes'] = None
+
 # --- SIDEBAR ---
 with st.sidebar:
     st.image("https://placehold.co/300x100/003366/FFFFFF?text=VALV-SIZ", use_column_width=True)
@@ -58,32 +114,36 @@ if st.session_state.step == 1:
         }
     s1_data = st.session_state.step1_data
     st.subheader("Fluid Information")
-    s1_data['fluid_type'] = st.selectbox("Fluid Type", ["Liquid", "Gas/Vapor"], index=["Liquid", "Gas/Vapor"].index(s1_data['fluid_type']), help="Select if the process medium is a liquid or a gas/vapor.")
-    s1_data['fluid_name'] = st.text_input("Fluid Name", value=s1_data['fluid_name'], help="Enter the common name of the fluid.")
-    s1_data['fluid_nature'] = st.selectbox("Fluid Nature", ["Clean", "Corrosive", "Abrasive", "Flashing/Cavitating"], index=["Clean", "Corrosive", "Abrasive", "Flashing/Cavitating"].index(s1_data['fluid_nature']), help="Characterize the fluid to aid material selection.")
-    st.subheader("Operating Conditions")
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        s1_data['p1'] = st.number_input(f"Inlet Pressure (P1) [{units['pressure']}]", min_value=0.1, value=s1_data['p1'], step=0.1, help="Pressure at the valve inlet.")
-        s1_data['t1'] = st.number_input(f"Inlet Temperature (T1) [{units['temperature']}]", value=s1_data['t1'], help="Temperature at the valve inlet.")
-        s1_data['flow_rate'] = st.number_input(f"Flow Rate (Q) [{units['flow_liquid' if s1_data['fluid_type'] == 'Liquid' else 'flow_gas']}]", min_value=0.1, value=s1_data['flow_rate'], step=1.0, help="Required flow rate through the valve.")
-    with col2:
-        s1_data['p2'] = st.number_input(f"Outlet Pressure (P2) [{units['pressure']}]", min_value=0.1, value=s1_data['p2'], step=0.1, help="Pressure at the valve outlet.")
-        if s1_data['fluid_type'] == "Liquid":
-            s1_data['rho'] = st.number_input(f"Density / Specific Gravity [{units['density']}]", value=s1_data['rho'], min_value=0.1, help="For Metric, use Density in kg/m³. For Imperial, use Specific Gravity (Water=1).")
-            s1_data['pv'] = st.number_input(f"Vapor Pressure (Pv) [{units['pressure']}]", value=s1_data['pv'], min_value=0.0, help="Absolute vapor pressure of the liquid at inlet temperature.")
-        else:
-            s1_data['mw'] = st.number_input("Molecular Weight (MW)", value=s1_data['mw'], min_value=1.0, help="Molecular weight of the gas (e.g., Air=28.97).")
-            s1_data['z'] = st.number_input("Compressibility Factor (Z)", value=s1_data['z'], min_value=0.2, max_value=2.0, help="Compressibility factor at inlet conditions. Use 1.0 for ideal gases.")
-    with col3:
+    s1_data['fluid_type'] = st.selectbox("Fluid Type", _FLUID_TYPES, index=_FLUID_TYPE_IDX[s1_data['fluid_type']], help="Select if the process medium is a liquid or a gas/vapor.")
+    # Batch the remaining inputs so the script reruns once on submit, not on every edit
+    with st.form("step1"):
+        s1_data['fluid_name'] = st.text_input("Fluid Name", value=s1_data['fluid_name'], help="Enter the common name of the fluid.")
+        s1_data['fluid_nature'] = st.selectbox("Fluid Nature", _FLUID_NATURES, index=_FLUID_NATURE_IDX[s1_data['fluid_nature']], help="Characterize the fluid to aid material selection.")
+        st.subheader("Operating Conditions")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            s1_data['p1'] = st.number_input(f"Inlet Pressure (P1) [{units['pressure']}]", min_value=0.1, value=s1_data['p1'], step=0.1, help="Pressure at the valve inlet.")
+            s1_data['t1'] = st.number_input(f"Inlet Temperature (T1) [{units['temperature']}]", value=s1_data['t1'], help="Temperature at the valve inlet.")
+            s1_data['flow_rate'] = st.number_input(f"Flow Rate (Q) [{units['flow_liquid' if s1_data['fluid_type'] == 'Liquid' else 'flow_gas']}]", min_value=0.1, value=s1_data['flow_rate'], step=1.0, help="Required flow rate through the valve.")
+        with col2:
+            s1_data['p2'] = st.number_input(f"Outlet Pressure (P2) [{units['pressure']}]", min_value=0.1, value=s1_data['p2'], step=0.1, help="Pressure at the valve outlet.")
+            if s1_data['fluid_type'] == "Liquid":
+                s1_data['rho'] = st.number_input(f"Density / Specific Gravity [{units['density']}]", value=s1_data['rho'], min_value=0.1, help="For Metric, use Density in kg/m³. For Imperial, use Specific Gravity (Water=1).")
+                s1_data['pv'] = st.number_input(f"Vapor Pressure (Pv) [{units['pressure']}]", value=s1_data['pv'], min_value=0.0, help="Absolute vapor pressure of the liquid at inlet temperature.")
+            else:
+                s1_data['mw'] = st.number_input("Molecular Weight (MW)", value=s1_data['mw'], min_value=1.0, help="Molecular weight of the gas (e.g., Air=28.97).")
+                s1_data['z'] = st.number_input("Compressibility Factor (Z)", value=s1_data['z'], min_value=0.2, max_value=2.0, help="Compressibility factor at inlet conditions. Use 1.0 for ideal gases.")
+        with col3:
+            if s1_data['fluid_type'] == "Liquid":
+                s1_data['pc'] = st.number_input(f"Critical Pressure (Pc) [{units['pressure']}]", value=s1_data['pc'], min_value=0.1, help="Absolute critical pressure of the liquid.")
+                s1_data['vc'] = st.number_input(f"Viscosity [{units['viscosity']}]", value=s1_data['vc'], min_value=0.1, help="Liquid viscosity at inlet temperature.")
+            else:
+                s1_data['k'] = st.number_input("Specific Heat Ratio (k = Cp/Cv)", value=s1_data['k'], min_value=1.0, max_value=2.0, help="Ratio of specific heats for the gas.")
+        submitted = st.form_submit_button("Save and Go to Step 2 ➡️")
+    if submitted:
+        # Form values only update on submit, so ΔP is derived and shown from the submitted pressures
         dp = s1_data['p1'] - s1_data['p2']
         st.metric(label=f"Differential Pressure (ΔP) [{units['pressure']}]", value=f"{dp:.2f}")
-        if s1_data['fluid_type'] == "Liquid":
-            s1_data['pc'] = st.number_input(f"Critical Pressure (Pc) [{units['pressure']}]", value=s1_data['pc'], min_value=0.1, help="Absolute critical pressure of the liquid.")
-            s1_data['vc'] = st.number_input(f"Viscosity [{units['viscosity']}]", value=s1_data['vc'], min_value=0.1, help="Liquid viscosity at inlet temperature.")
-        else:
-            s1_data['k'] = st.number_input("Specific Heat Ratio (k = Cp/Cv)", value=s1_data['k'], min_value=1.0, max_value=2.0, help="Ratio of specific heats for the gas.")
-    if st.button("Save and Go to Step 2 ➡️"):
         if s1_data['p1'] <= s1_data['p2']:
             st.error("Error: Inlet Pressure (P1) must be greater than Outlet Pressure (P2). Please correct the values.")
         else:
@@ -107,8 +167,7 @@ elif st.session_state.step == 2:
     s2_data = st.session_state.step2_data
     col1, col2 = st.columns(2)
     with col1:
-        valve_types = ["Globe", "Ball (Segmented)", "Butterfly"]
-        new_valve_type = st.selectbox("Select Valve Type", valve_types, index=valve_types.index(s2_data['valve_type']), help="Select the mechanical type of the valve.")
+        new_valve_type = st.selectbox("Select Valve Type", _VALVE_TYPES, index=_VALVE_TYPE_IDX[s2_data['valve_type']], help="Select the mechanical type of the valve.")
         available_styles = valve_data.get_valve_styles(new_valve_type)
         if new_valve_type != s2_data['valve_type']:
             s2_data['valve_type'] = new_valve_type
@@ -121,27 +180,32 @@ elif st.session_state.step == 2:
             s2_data['fl'] = valve_specific_data.get('FL', 0.9)
             s2_data['kc'] = valve_specific_data.get('Kc', 0.7)
             st.rerun()
-        rec_char = helpers.recommend_characteristic(st.session_state.input_data)
-        st.info(f"**Recommendation:** Based on your process, an **{rec_char}** characteristic is recommended for better control.")
-        s2_data['valve_char'] = st.selectbox("Valve Characteristic", ["Equal Percentage", "Linear", "Quick Opening"], help="Select the relationship between valve travel and flow rate.")
     with col2:
-        globe_sizes = [1, 2, 3, 4, 6, 8, 10, 12, 14, 16, 18, 20, 24]
-        large_sizes = globe_sizes + [30, 36, 42, 48, 54, 60, 66, 72]
-        if s2_data['valve_type'] == 'Globe':
-            available_sizes = globe_sizes
-        else:
-            available_sizes = large_sizes
-        if s2_data['valve_size_nominal'] not in available_sizes:
-            s2_data['valve_size_nominal'] = available_sizes[0]
-        current_size_index = available_sizes.index(s2_data['valve_size_nominal'])
-        s2_data['valve_size_nominal'] = st.selectbox("Nominal Valve Size (inches)", available_sizes, index=current_size_index, help="Select the nominal pipe size for the valve. Available sizes depend on valve type.")
         valve_specific_data = valve_data.get_valve_data(s2_data['valve_type'], s2_data['valve_style'])
         st.write("**Typical Valve Coefficients:**")
         st.json(valve_specific_data)
-        s2_data['fl'] = st.number_input("Liquid Pressure Recovery Factor (FL)", value=s2_data['fl'], step=0.01, help="Override if you have specific vendor data. Value is suggested by valve style.")
-        s2_data['kc'] = st.number_input("Cavitation Index Factor (Kc)", value=s2_data['kc'], step=0.01, help="Override if you have specific vendor data. Value is suggested by valve style.")
-    if st.button("Save and Go to Step 3 ➡️"):
+    # Type and style stay outside the form as they repopulate the options below
+    with st.form("step2"):
+        col1, col2 = st.columns(2)
+        with col1:
+            rec_char = helpers.recommend_characteristic(st.session_state.input_data)
+            st.info(f"**Recommendation:** Based on your process, an **{rec_char}** characteristic is recommended for better control.")
+            s2_data['valve_char'] = st.selectbox("Valve Characteristic", _VALVE_CHARS, help="Select the relationship between valve travel and flow rate.")
+        with col2:
+            if s2_data['valve_type'] == 'Globe':
+                available_sizes, size_index = _GLOBE_SIZES, _GLOBE_SIZE_IDX
+            else:
+                available_sizes, size_index = _LARGE_SIZES, _LARGE_SIZE_IDX
+            if s2_data['valve_size_nominal'] not in size_index:
+                s2_data['valve_size_nominal'] = available_sizes[0]
+            current_size_index = size_index[s2_data['valve_size_nominal']]
+            s2_data['valve_size_nominal'] = st.selectbox("Nominal Valve Size (inches)", available_sizes, index=current_size_index, help="Select the nominal pipe size for the valve. Available sizes depend on valve type.")
+            s2_data['fl'] = st.number_input("Liquid Pressure Recovery Factor (FL)", value=s2_data['fl'], step=0.01, help="Override if you have specific vendor data. Value is suggested by valve style.")
+            s2_data['kc'] = st.number_input("Cavitation Index Factor (Kc)", value=s2_data['kc'], step=0.01, help="Override if you have specific vendor data. Value is suggested by valve style.")
+        submitted = st.form_submit_button("Save and Go to Step 3 ➡️")
+    if submitted:
         st.session_state.input_data.update(s2_data)
+        st.session_state.input_data['valve_specifics'] = valve_specific_data
         del st.session_state.step2_data
         next_step()
         st.rerun()
@@ -151,10 +215,19 @@ elif st.session_state.step == 2:
 elif st.session_state.step == 3:
     st.header("Step 3: Sizing Calculation Results")
     try:
-        if st.session_state.input_data['fluid_type'] == 'Liquid':
-            results = liquid_sizing.calculate_liquid_cv(st.session_state.input_data)
+        # Reuse the previous sizing result when none of the scalar inputs changed
+        sizing_key = helpers.freeze_inputs(st.session_state.input_data)
+        if st.session_state.get('_sizing_key') == sizing_key:
+            results = st.session_state._sizing_results
         else:
-            results = gas_sizing.calculate_gas_cv(st.session_state.input_data)
+            if st.session_state.input_data['fluid_type'] == 'Liquid':
+                from calculations import liquid_sizing
+                results = liquid_sizing.calculate_liquid_cv(st.session_state.input_data)
+            else:
+                from calculations import gas_sizing
+                results = gas_sizing.calculate_gas_cv(st.session_state.input_data)
+            st.session_state._sizing_key = sizing_key
+            st.session_state._sizing_results = results
         st.session_state.results.update(results)
         st.subheader("Required Flow Coefficient (Cv)")
         st.metric("Calculated Cv", f"{results['cv']:.2f}")
@@ -169,9 +242,7 @@ elif st.session_state.step == 3:
         with st.expander("Rangeability Analysis", expanded=True):
             try:
                 valve_size = st.session_state.input_data['valve_size_nominal']
-                valve_type = st.session_state.input_data['valve_type']
-                valve_style = st.session_state.input_data['valve_style']
-                valve_specifics = valve_data.get_valve_data(valve_type, valve_style)
+                valve_specifics = st.session_state.input_data['valve_specifics']
                 inherent_rangeability = valve_specifics.get("Rangeability", 30)
                 rated_cv = valve_data.get_rated_cv(valve_size)
                 min_cv = rated_cv / inherent_rangeability
@@ -208,7 +279,14 @@ elif st.session_state.step == 3:
 elif st.session_state.step == 4:
     st.header("Step 4: Noise Prediction (IEC 60534-8-3 Model)")
     try:
-        noise_results = noise_prediction.predict_noise(st.session_state.input_data, st.session_state.results)
+        from calculations import noise_prediction
+        noise_key = (helpers.freeze_inputs(st.session_state.input_data, noise_prediction.INPUT_KEYS), helpers.freeze_inputs(st.session_state.results, noise_prediction.RESULT_KEYS))
+        if st.session_state.get('_noise_key') == noise_key:
+            noise_results = st.session_state._noise_results
+        else:
+            noise_results = noise_prediction.predict_noise(st.session_state.input_data, st.session_state.results)
+            st.session_state._noise_key = noise_key
+            st.session_state._noise_results = noise_results
         st.session_state.results.update(noise_results)
         st.metric("Predicted Noise Level (at 1m)", f"{noise_results['total_noise_dba']:.1f} dBA")
         if noise_results['total_noise_dba'] > 85:
@@ -225,32 +303,7 @@ elif st.session_state.step == 4:
 # --- STEP 5: Actuator, Materials & Final Selection ---
 elif st.session_state.step == 5:
     st.header("Step 5: Actuator, Materials, and Final Selection")
-    with st.expander("Actuator Sizing", expanded=True):
-        fail_position = st.radio("Fail-Safe Position", ["Fail Close (FC)", "Fail Open (FO)"], horizontal=True, help="The position the valve should move to on loss of power/air.")
-        st.session_state.input_data['fail_position'] = fail_position
-        actuator_results = actuator_sizing.size_actuator(st.session_state.input_data, st.session_state.results)
-        st.session_state.results.update(actuator_results)
-        if st.session_state.input_data['valve_type'] == 'Globe':
-            st.metric("Required Actuator Thrust", f"{actuator_results['required_force']:.2f} {units['force']}")
-        else:
-            st.metric("Required Actuator Torque", f"{actuator_results['required_torque']:.2f} {units['torque']}")
-        st.info(f"**Recommendation:** {actuator_results['actuator_recommendation']}")
-    with st.expander("Material Selection", expanded=True):
-        material_results = materials.select_materials(st.session_state.input_data)
-        st.session_state.results.update(material_results)
-        st.write("**Recommended Materials:**")
-        df_materials = pd.DataFrame([material_results['recommendations']])
-        st.table(df_materials)
-        st.success(f"**Compliance Check:** {material_results['compliance_check']}")
-    with st.expander("Valve Dynamic Characteristic Curve", expanded=True):
-        fig = helpers.plot_valve_characteristic(st.session_state.input_data, st.session_state.results['cv'])
-        st.plotly_chart(fig, use_container_width=True)
-        try:
-            img_bytes = fig.to_image(format="png", width=800, height=400, scale=2)
-            st.session_state.results['plot_image_bytes'] = img_bytes
-        except Exception as e:
-            st.warning(f"Could not generate plot image for report: {e}")
-            st.session_state.results['plot_image_bytes'] = None
+    _step5()
     col1, col2 = st.columns([1,5])
     with col1: st.button("⬅️ Back to Step 4", on_click=prev_step)
     with col2: st.button("Finalize and Generate Report ➡️", on_click=next_step)
@@ -263,7 +316,7 @@ elif st.session_state.step == 6:
         col1, col2 = st.columns(2)
         with col1:
             st.write("**Process Inputs:**")
-            st.json({k: v for k, v in st.session_state.input_data.items() if k not in ['units']})
+            st.json({k: v for k, v in st.session_state.input_data.items() if k not in ['units', 'valve_specifics']})
         with col2:
             st.write("**Sizing Results:**")
             st.json({k: v for k, v in st.session_state.results.items() if k != 'plot_image_bytes'})
@@ -275,6 +328,8 @@ elif st.session_state.step == 6:
         "results": st.session_state.results,
         "report_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     }
+    # The report generator is only needed on this step, so defer its import here
+    from reporting import pdf_generator
     # Correctly unpack the tuple (filename, data) returned by the function
     pdf_filename, pdf_bytes = pdf_generator.create_pdf_report(report_data)
     
@@ -1,21 +1,45 @@
+from functools import lru_cache
+from math import pi
 from utils.unit_converters import convert_pressure
 
+# Imperial to Metric output conversions
+_LBF_TO_N = 4.44822
+_FTLBF_TO_NM = 1.35582
+
 def size_actuator(inputs, results):
     """
     Calculates the required actuator thrust or torque.
     This is a simplified calculation; vendor software is required for final selection.
     """
     valve_type = inputs['valve_type']
-    valve_size = inputs['valve_size_nominal']
-    p1 = convert_pressure(inputs['p1'], inputs['unit_system'], 'psi')
-    dp = convert_pressure(inputs['dp'], inputs['unit_system'], 'psi')
+    required_force, required_torque = _actuator_base(
+        valve_type, inputs['valve_size_nominal'], inputs['dp'], inputs['unit_system']
+    )
+
+    if valve_type == 'Globe':
+        actuator_recommendation = f"A pneumatic spring-diaphragm or piston actuator capable of providing at least {required_force:.2f} {inputs['units']['force']} of thrust is recommended."
+    else: # Butterfly or Ball
+        actuator_recommendation = f"A pneumatic or electric rotary actuator (e.g., rack-and-pinion) capable of providing at least {required_torque:.2f} {inputs['units']['torque']} of torque is recommended."
+
+    return {
+        "required_force": required_force,
+        "required_torque": required_torque,
+        "actuator_recommendation": actuator_recommendation
+    }
+
+@lru_cache(maxsize=256)
+def _actuator_base(valve_type, valve_size, dp, unit_system):
+    """
+    Returns (required_force, required_torque) in output units.
+    Independent of the fail-safe position, so toggling it reuses the cached values.
+    """
+    dp = convert_pressure(dp, unit_system, 'psi')
     
     # Estimate valve seat area (pi * r^2)
-    seat_area = 3.14159 * (valve_size / 2)**2
+    seat_area = 0.25 * pi * valve_size * valve_size
 
     required_force = 0
     required_torque = 0
-    actuator_recommendation = ""
     
     if valve_type == 'Globe':
         # Thrust calculation: Force = Area * Pressure
@@ -26,10 +50,8 @@ def size_actuator(inputs, results):
         required_force = unbalanced_force * 1.3
         
         # Convert to Newtons if Metric
-        if inputs['unit_system'] == 'Metric':
-            required_force *= 4.44822 # lbf to N
-        
-        actuator_recommendation = f"A pneumatic spring-diaphragm or piston actuator capable of providing at least {required_force:.2f} {inputs['units']['force']} of thrust is recommended."
+        if unit_system == 'Metric':
+            required_force *= _LBF_TO_N
 
     else: # Butterfly or Ball
         # Torque is more complex, involving hydrodynamic and bearing friction forces.
@@ -46,14 +68,7 @@ def size_actuator(inputs, results):
         required_torque = seating_torque * 1.5
         
         # Convert to Nm if Metric
-        if inputs['unit_system'] == 'Metric':
-            required_torque *= 1.35582 # ft-lbf to Nm
-            
-        actuator_recommendation = f"A pneumatic or electric rotary actuator (e.g., rack-and-pinion) capable of providing at least {required_torque:.2f} {inputs['units']['torque']} of torque is recommended."
-
-    return {
-        "required_force": required_force,
-        "required_torque": required_torque,
-        "actuator_recommendation": actuator_recommendation
-    }
+        if unit_system == 'Metric':
+            required_torque *= _FTLBF_TO_NM
 
+    return required_force, required_torque
@@ -1,7 +1,10 @@
-import numpy as np
+from math import sqrt
 from utils.unit_converters import convert_pressure, convert_flow_gas, convert_temperature
 from data import valve_data
 
+# Reciprocal of the gas sizing constant (scfh, psia, °R), hoisted out of the Cv division
+_INV_1360 = 1.0 / 1360
+
 def calculate_gas_cv(data):
     """
     Calculates the required flow coefficient (Cv) for gas or vapor service.
@@ -12,14 +15,27 @@ def calculate_gas_cv(data):
     t1_abs = convert_temperature(data['t1'], data['unit_system'], 'R')
     flow_rate_scfh = convert_flow_gas(data['flow_rate'], data['unit_system'], 'scfh')
     
-    mw = data['mw']
-    k = data['k']
-    z = data['z']
-    
     # Get valve-specific Xt from data file
     valve_specifics = valve_data.get_valve_data(data['valve_type'], data['valve_style'])
     xt = valve_specifics.get('Xt', 0.75) # Use selected Xt, default to 0.75 if not found
-    
+
+    cv, is_choked, y, x, x_choked = _gas_cv_kernel(
+        p1_abs, p2_abs, t1_abs, flow_rate_scfh, data['mw'], data['k'], data['z'], xt
+    )
+
+    return {
+        "cv": cv,
+        "is_choked": is_choked,
+        "expansion_factor_y": y,
+        "pressure_drop_ratio_x": x,
+        "choked_pressure_drop_ratio": x_choked
+    }
+
+def _gas_cv_kernel(p1_abs, p2_abs, t1_abs, flow_rate_scfh, mw, k, z, xt):
+    """
+    Gas Cv arithmetic on inputs already converted to Imperial base units.
+    Returns (cv, is_choked, y, x, x_choked).
+    """
     # Ratio of specific heats factor
     fk = k / 1.40
     
@@ -43,17 +59,11 @@ def calculate_gas_cv(data):
     
     # Calculate Cv
     # Formula for Imperial units: Cv = Q / (1360 * Y * P1 * sqrt(x / (MW * T1 * Z)))
-    denominator = 1360 * y * p1_abs * np.sqrt(x_sizing / (mw * t1_abs * z))
+    sqrt_arg = x_sizing / (mw * t1_abs * z)
+    denominator = y * p1_abs * sqrt(sqrt_arg)
     if denominator == 0:
         raise ValueError("Calculation error: denominator is zero. Check inputs.")
         
-    cv = flow_rate_scfh / denominator
-
-    return {
-        "cv": cv,
-        "is_choked": is_choked,
-        "expansion_factor_y": y,
-        "pressure_drop_ratio_x": x,
-        "choked_pressure_drop_ratio": x_choked
-    }
+    cv = flow_rate_scfh * _INV_1360 / denominator
 
+    return cv, is_choked, y, x, x_choked
@@ -1,44 +1,19 @@
 import numpy as np
-from utils.unit_converters import convert_pressure, convert_flow_liquid, convert_density
+from math import sqrt
+from utils.unit_converters import convert, convert_pressure, convert_flow_liquid, convert_density
 
 def calculate_liquid_cv(data):
     """
     Calculates the required flow coefficient (Cv) for liquid service.
     Follows the ISA S75.01 / IEC 60534-2-1 standards.
     """
-    # Convert units to a consistent base (Imperial for Cv calculation)
-    p1 = convert_pressure(data['p1'], data['unit_system'], 'psi')
-    p2 = convert_pressure(data['p2'], data['unit_system'], 'psi')
-    pv = convert_pressure(data['pv'], data['unit_system'], 'psi')
-    pc = convert_pressure(data['pc'], data['unit_system'], 'psi')
+    p1, p2, pv, pc, Gf = _base_conditions(data)
     flow_rate = convert_flow_liquid(data['flow_rate'], data['unit_system'], 'gpm')
-    
-    # Specific Gravity (Gf)
-    if data['unit_system'] == 'Metric':
-        # rho is in kg/m3, convert to specific gravity
-        Gf = data['rho'] / 1000.0
-    else:
-        # rho is already specific gravity in Imperial
-        Gf = data['rho']
 
     fl = data.get('fl', 0.9)
     kc = data.get('kc', 0.7)
 
-    # Differential pressure
-    dp = p1 - p2
-
-    # Choked flow calculation (delta P allowable)
-    ff = 0.96 - 0.28 * (pv / pc) ** 0.5
-    dp_allowable = (fl ** 2) * (p1 - ff * pv)
-
-    # Use the smaller of actual or allowable delta P
-    dp_sizing = min(dp, dp_allowable)
-
-    if dp_sizing <= 0:
-        raise ValueError("Sizing pressure drop (dP) must be positive. Check inlet/outlet pressures.")
-
-    # Calculate Cv
-    cv = flow_rate * (Gf / dp_sizing) ** 0.5
+    cv, dp_sizing = _liquid_cv_kernel(p1, p2, pv, pc, flow_rate, Gf, fl)
 
     # Flashing and Cavitation Analysis
     is_flashing = p2 < pv
@@ -64,3 +39,64 @@ def calculate_liquid_cv(data):
         "dp_sizing": dp_sizing
     }
 
+def calculate_liquid_cv_batch(data, flow_rate_array):
+    """
+    Calculates the required Cv for an array of flow rates at otherwise fixed process conditions.
+    Flow rates are in the input unit system; returns an ndarray of Cv values.
+
+    Matches calculate_liquid_cv point by point:
+
+    >>> data = {'p1': 10.0, 'p2': 5.0, 'pv': 0.03, 'pc': 221.0, 'rho': 1000.0,
+    ...         'fl': 0.9, 'kc': 0.7, 'unit_system': 'Metric'}
+    >>> flows = (50.0, 100.0, 250.0)
+    >>> batch = calculate_liquid_cv_batch(data, flows)
+    >>> single = [calculate_liquid_cv(dict(data, flow_rate=q))['cv'] for q in flows]
+    >>> bool(np.allclose(batch, single, rtol=1e-12))
+    True
+    """
+    p1, p2, pv, pc, Gf = _base_conditions(data)
+    # Cv is linear in flow, so the kernel is evaluated once per unit flow and the whole array scaled
+    cv_per_gpm, _ = _liquid_cv_kernel(p1, p2, pv, pc, 1.0, Gf, data.get('fl', 0.9))
+    flow_rate_gpm = convert(np.asarray(flow_rate_array, dtype=float), 'flow_liquid', data['unit_system'], 'gpm')
+    return flow_rate_gpm * cv_per_gpm
+
+def _base_conditions(data):
+    """Converts pressures to psi and density to specific gravity. Returns (p1, p2, pv, pc, Gf)."""
+    # Convert units to a consistent base (Imperial for Cv calculation)
+    p1 = convert_pressure(data['p1'], data['unit_system'], 'psi')
+    p2 = convert_pressure(data['p2'], data['unit_system'], 'psi')
+    pv = convert_pressure(data['pv'], data['unit_system'], 'psi')
+    pc = convert_pressure(data['pc'], data['unit_system'], 'psi')
+
+    # Specific Gravity (Gf)
+    if data['unit_system'] == 'Metric':
+        # rho is in kg/m3, convert to specific gravity
+        Gf = data['rho'] / 1000.0
+    else:
+        # rho is already specific gravity in Imperial
+        Gf = data['rho']
+
+    return p1, p2, pv, pc, Gf
+
+def _liquid_cv_kernel(p1, p2, pv, pc, flow_rate, Gf, fl):
+    """
+    Liquid Cv arithmetic on inputs already converted to Imperial base units.
+    Returns (cv, dp_sizing).
+    """
+    # Differential pressure
+    dp = p1 - p2
+
+    # Choked flow calculation (delta P allowable)
+    ff = 0.96 - 0.28 * sqrt(pv / pc)
+    dp_allowable = (fl ** 2) * (p1 - ff * pv)
+
+    # Use the smaller of actual or allowable delta P
+    dp_sizing = min(dp, dp_allowable)
+
+    if dp_sizing <= 0:
+        raise ValueError("Sizing pressure drop (dP) must be positive. Check inlet/outlet pressures.")
+
+    # Calculate Cv
+    cv = flow_rate * sqrt(Gf / dp_sizing)
+
+    return cv, dp_sizing
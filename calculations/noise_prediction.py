@@ -1,4 +1,8 @@
-import numpy as np
+import math
+
+# Inputs and results read by predict_noise; callers use them to key reruns on unchanged data
+INPUT_KEYS = ('p1', 'p2', 'valve_type', 'fluid_type')
+RESULT_KEYS = ('cv', 'cavitation_status', 'is_flashing')
 
 def predict_noise(inputs, results):
     """
@@ -18,15 +22,15 @@ def predict_noise(inputs, results):
     if inputs['fluid_type'] == 'Liquid':
         # Liquid noise is primarily from cavitation/flashing
         if results.get('cavitation_status') == "Cavitation Likely":
-            base_noise = 80 + 10 * np.log10(dp * cv)
+            base_noise = 80 + 10 * math.log10(dp * cv)
         elif results.get('is_flashing'):
-            base_noise = 85 + 10 * np.log10(dp * cv)
+            base_noise = 85 + 10 * math.log10(dp * cv)
         else:
-            base_noise = 60 + 10 * np.log10(dp * cv)
+            base_noise = 60 + 10 * math.log10(dp * cv)
     else: # Gas
         # Gas noise is primarily aerodynamic
         mach_velocity_simplified = 0.1 + (dp/p1) * 0.8 # Simplified proxy for mach number
-        base_noise = 70 + 20 * np.log10(mach_velocity_simplified * 1000) + 10 * np.log10(cv)
+        base_noise = 70 + 20 * math.log10(mach_velocity_simplified * 1000) + 10 * math.log10(cv)
 
     # Adjustments for valve type (transmission loss)
     if valve_type == "Globe":
@@ -1,3 +1,26 @@
+# Default materials for standard service
+DEFAULT_BODY = "Carbon Steel (ASTM A216 WCB)"
+DEFAULT_TRIM = "Stainless Steel (316 SS)"
+
+# Material overrides and compliance notes by fluid nature
+_NATURE = {
+    "Corrosive": {
+        "body": "Stainless Steel (ASTM A351 CF8M)",
+        "trim": "Alloy 20 or Hastelloy C",
+        "compliance": " Sour service (NACE) compliance for selected alloys must be verified."
+    },
+    "Abrasive": {"trim": "Stellite Hard Facing or Ceramic"},
+    "Flashing/Cavitating": {"trim": "Stellite Hard Facing on 316 SS Base"},
+}
+
+# Temperature limits (°C) beyond which the body material is overridden
+_HIGH_TEMP_LIMIT = 427 # approx 800F
+_HIGH_TEMP_BODY = "Chrome-Moly (ASTM A217 C5/C12)"
+_LOW_TEMP_LIMIT = -29 # approx -20F, low temp / cryogenic
+_LOW_TEMP_BODY = "Stainless Steel (ASTM A351 CF8M)"
+
+_BASE_COMPLIANCE = "Materials selected are generally compliant with NACE MR0175 and ASME B16.34 for standard service. Final verification against specific service conditions is required."
+
 def select_materials(data):
     """
     Recommends valve materials based on fluid nature, temperature, and pressure.
@@ -7,33 +30,18 @@ def select_materials(data):
     temp = data['t1']
     pressure = data['p1']
     
-    # Default to standard materials
-    body_material = "Carbon Steel (ASTM A216 WCB)"
-    trim_material = "Stainless Steel (316 SS)"
-    
-    # Logic for corrosive service
-    if fluid_nature == "Corrosive":
-        body_material = "Stainless Steel (ASTM A351 CF8M)"
-        trim_material = "Alloy 20 or Hastelloy C"
-        
-    # Logic for abrasive service
-    if fluid_nature == "Abrasive":
-        trim_material = "Stellite Hard Facing or Ceramic"
-        
-    # Logic for flashing/cavitating service
-    if fluid_nature == "Flashing/Cavitating":
-        trim_material = "Stellite Hard Facing on 316 SS Base"
+    overrides = _NATURE.get(fluid_nature, {})
+    body_material = overrides.get("body", DEFAULT_BODY)
+    trim_material = overrides.get("trim", DEFAULT_TRIM)
 
     # Temperature-based adjustments
-    if temp > 427: # High temp (approx 800F)
-        body_material = "Chrome-Moly (ASTM A217 C5/C12)"
-    elif temp < -29: # Low temp / cryogenic (approx -20F)
-        body_material = "Stainless Steel (ASTM A351 CF8M)"
+    if temp > _HIGH_TEMP_LIMIT:
+        body_material = _HIGH_TEMP_BODY
+    elif temp < _LOW_TEMP_LIMIT:
+        body_material = _LOW_TEMP_BODY
         
     # Compliance check string
-    compliance_check = "Materials selected are generally compliant with NACE MR0175 and ASME B16.34 for standard service. Final verification against specific service conditions is required."
-    if fluid_nature == "Corrosive":
-        compliance_check += " Sour service (NACE) compliance for selected alloys must be verified."
+    compliance_check = _BASE_COMPLIANCE + overrides.get("compliance", "")
 
     return {
         "recommendations": {
@@ -44,4 +52,3 @@ def select_materials(data):
         },
         "compliance_check": compliance_check
     }
-
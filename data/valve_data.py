@@ -3,6 +3,8 @@ This file contains typical characteristic coefficients for various control valve
 In a real-world, highly accurate application, this data would come from extensive manufacturer catalogs.
 The values here are representative for general engineering purposes.
 """
+from functools import lru_cache
+import numpy as np
 
 VALVE_COEFFICIENTS = {
     "Globe": {
@@ -70,21 +72,37 @@ VALVE_RATED_CVS = {
     72: 65000,
 }
 
+# Fallbacks for unknown valve types/styles, built once like the tables above
+DEFAULT_VALVE_DATA = {"FL": 0.9, "Kc": 0.7, "Xt": 0.75, "Rangeability": 30, "Style": "Default general purpose values."}
+DEFAULT_VALVE_STYLES = ("Default Style",)
+
+# Flattened views of VALVE_COEFFICIENTS so each lookup is a single hash probe
+_FLAT = {(valve_type, valve_style): coefficients
+         for valve_type, styles in VALVE_COEFFICIENTS.items()
+         for valve_style, coefficients in styles.items()}
+_STYLES = {valve_type: tuple(styles) for valve_type, styles in VALVE_COEFFICIENTS.items()}
+
+@lru_cache(maxsize=None)
 def get_valve_data(valve_type, valve_style):
     """Retrieves the characteristic coefficients for a specific valve type and style."""
-    try:
-        return VALVE_COEFFICIENTS[valve_type][valve_style]
-    except KeyError:
-        return {"FL": 0.9, "Kc": 0.7, "Xt": 0.75, "Rangeability": 30, "Style": "Default general purpose values."}
+    return _FLAT.get((valve_type, valve_style), DEFAULT_VALVE_DATA)
 
+@lru_cache(maxsize=None)
 def get_valve_styles(valve_type):
-    """Returns a list of available styles for a given valve type."""
-    try:
-        return list(VALVE_COEFFICIENTS[valve_type].keys())
-    except KeyError:
-        return ["Default Style"]
+    """Returns a tuple of available styles for a given valve type."""
+    return _STYLES.get(valve_type, DEFAULT_VALVE_STYLES)
+
+# Sorted size/Cv arrays for nearest-upper-size lookup
+_RATED_SIZES = np.array(sorted(VALVE_RATED_CVS))
+_RATED_CVS = np.array([VALVE_RATED_CVS[size] for size in _RATED_SIZES])
 
 def get_rated_cv(valve_size):
-    """Retrieves the typical rated Cv for a given valve size."""
-    return VALVE_RATED_CVS.get(valve_size, 50) # Default to 50 if size not found
+    """
+    Retrieves the typical rated Cv for a given valve size.
+    Sizes between standard sizes map to the next larger one; sizes above the table use the largest.
+    Accepts a scalar or an array of sizes.
+    """
+    idx = np.minimum(np.searchsorted(_RATED_SIZES, valve_size), len(_RATED_CVS) - 1)
+    rated_cv = _RATED_CVS[idx]
+    return int(rated_cv) if np.ndim(rated_cv) == 0 else rated_cv
 
@@ -1,7 +1,8 @@
-import plotly.graph_objects as go
+from functools import lru_cache
+from types import MappingProxyType
 import numpy as np
 
-UNITS = {
+_UNITS = {
     'Metric': {
         'pressure': 'bar',
         'temperature': '°C',
@@ -24,9 +25,49 @@ UNITS = {
     }
 }
 
+# Read-only views, so every caller shares one label set that cannot be mutated
+UNITS = {system: MappingProxyType(labels) for system, labels in _UNITS.items()}
+
+# Travel grid and normalized inherent curves (Cv / rated Cv), evaluated once at import
+# Percent open; 2% steps near closed (quick opening knee) and above 60% (equal percentage knee),
+# 5% steps in between
+_TRAVEL = np.concatenate([
+    np.linspace(0, 10, 5, endpoint=False),
+    np.linspace(10, 60, 10, endpoint=False),
+    np.linspace(60, 100, 21),
+])
+_FRACTION = _TRAVEL / 100
+_LINEAR_CURVE = _FRACTION
+_QUICK_OPENING_CURVE = np.sqrt(_FRACTION) # Approximate quick opening curve
+# Equal percentage curves for the rangeabilities found in valve_data, plus the defaults
+_EQUAL_PCT_CURVES = {R: np.clip(R ** (_FRACTION - 1), 0, 1) for R in (20, 30, 40, 50, 80, 100)}
+
+@lru_cache(maxsize=None)
+def _layout():
+    """Static layout shared by every characteristic plot, built on first use."""
+    import plotly.graph_objects as go
+    return go.Layout(
+        title='Valve Dynamic Characteristic Curve',
+        xaxis_title='Valve Travel (% Open)',
+        yaxis_title='Flow Coefficient (Cv)',
+        legend_title='Characteristic',
+        template='plotly_dark'
+    )
+
+@lru_cache(maxsize=None)
 def get_units(unit_system):
     return UNITS.get(unit_system, UNITS['Metric'])
 
+def freeze_inputs(data, keys=None):
+    """Returns a hashable, order-independent snapshot of the scalar entries of a data dictionary."""
+    return tuple(sorted(
+        (k, v) for k, v in data.items()
+        if (keys is None or k in keys) and isinstance(v, (int, float, str, bool))
+    ))
+
+# dP / P1 above which an Equal Percentage characteristic is recommended
+_EQUAL_PCT_DP_RATIO = 0.35
+
 def recommend_characteristic(data):
     """Recommends a valve characteristic based on process conditions."""
     p1 = data.get('p1', 1)
@@ -34,54 +75,61 @@ def recommend_characteristic(data):
     
     # If pressure drop is a large percentage of inlet pressure, system is more linear
     # and a more non-linear valve (Equal Percentage) is needed.
-    if (dp / p1) > 0.35:
+    if (dp / p1) > _EQUAL_PCT_DP_RATIO:
         return "Equal Percentage"
     else:
         return "Linear"
 
+def recommend_characteristic_batch(p1, dp):
+    """Recommends a valve characteristic for arrays of operating points; returns an array of labels."""
+    p1 = np.asarray(p1, dtype=float)
+    dp = np.asarray(dp, dtype=float)
+    if np.any(p1 == 0):
+        raise ZeroDivisionError("Inlet pressure (p1) must be non-zero.")
+    return np.where(dp / p1 > _EQUAL_PCT_DP_RATIO, "Equal Percentage", "Linear")
+
 def plot_valve_characteristic(data, calculated_cv):
     """Plots the inherent vs installed valve characteristic curve."""
+    # Plotly is only needed here; importing it lazily keeps it off the other helpers' import path
+    import plotly.graph_objects as go
     valve_char = data.get('valve_char', 'Equal Percentage')
     rated_cv = data.get('rated_cv', calculated_cv * 2) # Estimate if not available
     
-    travel = np.linspace(0, 100, 101) # Percent open
+    travel = _TRAVEL
     
     # Inherent Characteristic (assumes constant pressure drop)
     if valve_char == 'Linear':
-        inherent_cv = (travel / 100) * rated_cv
+        curve = _LINEAR_CURVE
     elif valve_char == 'Quick Opening':
-        # Approximate quick opening curve
-        inherent_cv = np.sqrt(travel / 100) * rated_cv
+        curve = _QUICK_OPENING_CURVE
     else: # Equal Percentage
         R = data.get('inherent_rangeability', 50) # Use actual rangeability
-        inherent_cv = rated_cv * (R ** ((travel / 100) - 1))
+        curve = _EQUAL_PCT_CURVES.get(R)
+        if curve is None:
+            curve = R ** (_FRACTION - 1)
 
-    inherent_cv = np.clip(inherent_cv, 0, rated_cv)
+    # Scale into a fresh buffer (the cached curves must stay untouched), then clip in place
+    inherent_cv = np.multiply(curve, rated_cv)
+    np.clip(inherent_cv, 0, rated_cv, out=inherent_cv)
 
     # Installed Characteristic (simplified model)
     # This is a placeholder for a more complex calculation involving system pressure drop
-    installed_cv = inherent_cv * 0.85 # Assume some pressure loss in the system
+    installed_cv = np.empty_like(inherent_cv)
+    np.multiply(inherent_cv, 0.85, out=installed_cv) # Assume some pressure loss in the system
 
     # Create plot
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(x=travel, y=inherent_cv, mode='lines', name='Inherent Characteristic'))
-    fig.add_trace(go.Scatter(x=travel, y=installed_cv, mode='lines', name='Estimated Installed', line=dict(dash='dash')))
+    fig = go.Figure(layout=_layout())
+    fig.add_trace(go.Scattergl(x=travel, y=inherent_cv, mode='lines', name='Inherent Characteristic'))
+    fig.add_trace(go.Scattergl(x=travel, y=installed_cv, mode='lines', name='Estimated Installed', line=dict(dash='dash')))
     
     # Add operating point
     op_travel = (calculated_cv / rated_cv) * 100 if rated_cv > 0 else 0
     if 0 <= op_travel <= 100:
-        fig.add_trace(go.Scatter(
+        fig.add_trace(go.Scattergl(
             x=[op_travel], y=[calculated_cv],
             mode='markers', name='Operating Point',
             marker=dict(color='red', size=12, symbol='x')
         ))
 
-    fig.update_layout(
-        title='Valve Dynamic Characteristic Curve',
-        xaxis_title='Valve Travel (% Open)',
-        yaxis_title='Flow Coefficient (Cv)',
-        legend_title='Characteristic',
-        template='plotly_dark'
-    )
     return fig
 
@@ -1,45 +1,60 @@
+from functools import lru_cache
+
 # Conversion constants
 BAR_TO_PSI = 14.5038
 M3HR_TO_GPM = 4.40287
 NM3HR_TO_SCFH = 37.324 # Approximate, based on standard engineering practice
 
+# Reverse factors, precomputed so every conversion is a multiply
+PSI_TO_BAR = 1.0 / BAR_TO_PSI
+GPM_TO_M3HR = 1.0 / M3HR_TO_GPM
+SCFH_TO_NM3HR = 1.0 / NM3HR_TO_SCFH
+KGM3_TO_SG = 1.0 / 1000.0
+F_TO_C = 5.0 / 9.0
+
+# (kind, from_system, to_unit) -> (scale, offset), applied as value * scale + offset
+_CONV = {
+    ('pressure', 'Metric', 'psi'): (BAR_TO_PSI, 0.0),
+    ('pressure', 'Imperial', 'bar'): (PSI_TO_BAR, 0.0),
+    ('flow_liquid', 'Metric', 'gpm'): (M3HR_TO_GPM, 0.0),
+    ('flow_liquid', 'Imperial', 'm³/hr'): (GPM_TO_M3HR, 0.0),
+    ('density', 'Metric', 'SG'): (KGM3_TO_SG, 0.0),
+    ('density', 'Imperial', 'kg/m³'): (1000.0, 0.0),
+    ('temperature', 'Metric', '°F'): (9 / 5, 32.0),
+    ('temperature', 'Imperial', '°C'): (F_TO_C, -32.0 * F_TO_C),
+    ('flow_gas', 'Metric', 'scfh'): (NM3HR_TO_SCFH, 0.0),
+    ('flow_gas', 'Imperial', 'Nm³/hr'): (SCFH_TO_NM3HR, 0.0),
+}
+
+def convert(value, kind, from_system, to_unit):
+    """
+    Converts a quantity of the given kind from a unit system to a target unit.
+    Works on scalars and NumPy arrays alike; unknown combinations are returned unchanged.
+    """
+    scale, offset = _CONV.get((kind, from_system, to_unit), (1.0, 0.0))
+    return value * scale + offset
+
+@lru_cache(maxsize=2048)
 def convert_pressure(value, from_system, to_unit):
     """Converts pressure between Metric (bar) and Imperial (psi)."""
-    if from_system == 'Metric' and to_unit == 'psi':
-        return value * BAR_TO_PSI
-    if from_system == 'Imperial' and to_unit == 'bar':
-        return value / BAR_TO_PSI
-    return value # No conversion needed
+    return convert(value, 'pressure', from_system, to_unit)
 
+@lru_cache(maxsize=2048)
 def convert_flow_liquid(value, from_system, to_unit):
     """Converts liquid flow rate between Metric (m³/hr) and Imperial (gpm)."""
-    if from_system == 'Metric' and to_unit == 'gpm':
-        return value * M3HR_TO_GPM
-    if from_system == 'Imperial' and to_unit == 'm³/hr':
-        return value / M3HR_TO_GPM
-    return value
+    return convert(value, 'flow_liquid', from_system, to_unit)
 
+@lru_cache(maxsize=2048)
 def convert_density(value, from_system, to_unit):
     """Converts liquid density between Metric (kg/m³) and Imperial (SG)."""
-    if from_system == 'Metric' and to_unit == 'SG':
-        return value / 1000.0
-    if from_system == 'Imperial' and to_unit == 'kg/m³':
-        return value * 1000.0
-    return value
+    return convert(value, 'density', from_system, to_unit)
     
+@lru_cache(maxsize=2048)
 def convert_temperature(value, from_system, to_unit):
     """Converts temperature between Metric (°C) and Imperial (°F)."""
-    if from_system == 'Metric' and to_unit == '°F':
-        return (value * 9/5) + 32
-    if from_system == 'Imperial' and to_unit == '°C':
-        return (value - 32) * 5/9
-    return value
+    return convert(value, 'temperature', from_system, to_unit)
 
+@lru_cache(maxsize=2048)
 def convert_flow_gas(value, from_system, to_unit):
     """Converts gas flow rate between Metric (Nm³/hr) and Imperial (scfh)."""
-    if from_system == 'Metric' and to_unit == 'scfh':
-        return value * NM3HR_TO_SCFH
-    if from_system == 'Imperial' and to_unit == 'Nm³/hr':
-        return value / NM3HR_TO_SCFH
-    return value
-
+    return convert(value, 'flow_gas', from_system, to_unit)